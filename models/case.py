@@ -1,15 +1,21 @@
 #uuid 是 Python 內建模組
 #用來產生唯一識別碼
-import uuid 
+import uuid
+from dataclasses import dataclass, field
+from datetime import date
 
 
+# slots=True：固定欄位，不用每個實例各帶一個 __dict__（大量建立時省記憶體）
+# eq=False：Case 是「這一案」，比較的是身分，不是欄位內容
+# id 是一般欄位：沒給就建立時產生；從資料庫讀回來可以 Case(case_id=...) 帶回原本的 id
+# dataclasses.asdict() 會輸出 id，dataclasses.replace() 的複本沿用同一個 id（其他 model 也一樣）
+@dataclass(slots=True, eq=False)
 class Case:
-    def __init__(self):
-        self.case_id = str(uuid.uuid4()) #內部系統識別
-        self.jurisdiction = None #專利局/管轄機關
-        self.application_number = None #法律識別
-        self.filing_date = None #申請日
-        self.documents = [] #一個Case會有很多文件，用list
-        self.events = [] #一個Case會有很多event，用list
-        self.deadlines = [] #一個event會有多個狀態, 且Deadline有自己的狀態
-        self.tasks = [] #法律義務跟工作職務分離
+    case_id: str = field(default_factory=lambda: str(uuid.uuid4())) #內部系統識別
+    jurisdiction: str | None = None #專利局/管轄機關
+    application_number: str | None = None #法律識別
+    filing_date: date | None = None #申請日
+    documents: list = field(default_factory=list) #一個Case會有很多文件，用list
+    events: list = field(default_factory=list) #一個Case會有很多event，用list
+    deadlines: list = field(default_factory=list) #一個event會有多個狀態, 且Deadline有自己的狀態
+    tasks: list = field(default_factory=list) #法律義務跟工作職務分離
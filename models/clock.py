@@ -0,0 +1,35 @@
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime
+
+
+# 一批匯入共用的「建立時間」；沒有設定時為 None
+_BATCH_NOW = contextvars.ContextVar("batch_now", default=None)
+
+
+def now():
+    # 在 batch_timestamp() 裡面：回傳這一批共用的時間
+    # 在外面：跟以前一樣，每次呼叫 datetime.now()
+    batch_now = _BATCH_NOW.get()
+    if batch_now is None:
+        return datetime.now()
+    return batch_now
+
+
+@contextmanager
+def batch_timestamp(value=None):
+    '''
+    批次匯入時用：
+
+        with batch_timestamp():
+            for path in pdf_paths:
+                doc = Document(file_path=path)
+
+    這一批建立的物件 created_at 都一樣（只呼叫一次 datetime.now()），
+    也比較好看出「哪些東西是同一批進來的」。
+    '''
+    token = _BATCH_NOW.set(datetime.now() if value is None else value)
+    try:
+        yield _BATCH_NOW.get()
+    finally:
+        _BATCH_NOW.reset(token)
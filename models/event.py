@@ -1,17 +1,20 @@
 import uuid
-from datetime import datetime
+from dataclasses import dataclass, field
+from datetime import date, datetime
 
+from .clock import now
 
+
+@dataclass(slots=True, eq=False)
 class Event:
-    def __init__(self):
-        self.event_id = str(uuid.uuid4())     # 內部事件識別
-        self.case_id = None                   # 歸屬案件
-        self.document_id = None               # 由哪份 Document 觸發（可為 None，例如人工建立）
+    event_id: str = field(default_factory=lambda: str(uuid.uuid4()))  # 內部事件識別
+    case_id: str | None = None                        # 歸屬案件
+    document_id: str | None = None                    # 由哪份 Document 觸發（可為 None，例如人工建立）
 
-        self.event_type = None                # 例：OA_RECEIVED / GRANT_PUBLISHED / FILING_RECEIPT_RECEIVED
-        self.event_date = None                # 事件發生日（通常等於文件日期或收到日）
-        self.created_at = datetime.now()      # 系統建立時間
+    event_type: str | None = None                     # 例：OA_RECEIVED / GRANT_PUBLISHED / FILING_RECEIPT_RECEIVED
+    event_date: date | None = None                    # 事件發生日（通常等於文件日期或收到日）
+    created_at: datetime = field(default_factory=now)  # 系統建立時間
 
-        self.description = None               # 人類可讀描述（optional）
-        self.status = "OPEN"                  # OPEN / CLOSED / VOID
-        self.metadata = {}                    # 存 parser 產出的額外資訊（例如 OA 種類、局方欄位）
+    description: str | None = None                   # 人類可讀描述（optional）
+    status: str = "OPEN"                              # OPEN / CLOSED / VOID
+    metadata: dict = field(default_factory=dict)      # 存 parser 產出的額外資訊（例如 OA 種類、局方欄位）
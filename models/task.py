@@ -1,23 +1,26 @@
 import uuid
-from datetime import datetime
+from dataclasses import dataclass, field
+from datetime import date, datetime
 
+from .clock import now
 
+
+@dataclass(slots=True, eq=False)
 class Task:
-    def __init__(self):
-        self.task_id = str(uuid.uuid4())      # 內部任務識別
-        self.case_id = None                   # 歸屬案件
-        self.event_id = None                  # 這個 task 是回應哪個事件（可選）
-        self.deadline_id = None               # 這個 task 主要對應哪個期限（可選）
+    task_id: str = field(default_factory=lambda: str(uuid.uuid4()))  # 內部任務識別
+    case_id: str | None = None                        # 歸屬案件
+    event_id: str | None = None                       # 這個 task 是回應哪個事件（可選）
+    deadline_id: str | None = None                    # 這個 task 主要對應哪個期限（可選）
+
+    task_type: str | None = None                      # 例：DRAFT_OA_RESPONSE / REVIEW / FILE_RESPONSE / PAY_FEE
+    title: str | None = None                          # 顯示用標題
+    description: str | None = None                    # 任務細節
+
+    assignee: str | None = None                       # 指派給誰（先用字串即可）
+    priority: str = "NORMAL"                          # LOW / NORMAL / HIGH / URGENT
+
+    created_at: datetime = field(default_factory=now)
+    due_date: date | None = None                      # 工作內部期限（可等於 deadline due date 或更早）
+    status: str = "TODO"                              # TODO / DOING / DONE / CANCELLED / BLOCKED
 
-        self.task_type = None                 # 例：DRAFT_OA_RESPONSE / REVIEW / FILE_RESPONSE / PAY_FEE
-        self.title = None                     # 顯示用標題
-        self.description = None               # 任務細節
-        
-        self.assignee = None                  # 指派給誰（先用字串即可）
-        self.priority = "NORMAL"              # LOW / NORMAL / HIGH / URGENT
-        
-        self.created_at = datetime.now()
-        self.due_date = None                  # 工作內部期限（可等於 deadline due date 或更早）
-        self.status = "TODO"                  # TODO / DOING / DONE / CANCELLED / BLOCKED
-        
-        self.metadata = {}                    # 任務表單欄位、交付物連結等
+    metadata: dict = field(default_factory=dict)      # 任務表單欄位、交付物連結等
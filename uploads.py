@@ -1,5 +1,24 @@
+import argparse
+import hashlib
+import logging
+import mmap
+import os
+import queue
+import sys
+import threading
+import zlib
+from collections import deque
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
 import pymupdf
 
+try:
+    import pypdfium2 as pdfium #選用：PDF_BACKEND=pypdfium2 時才需要
+except ImportError:
+    pdfium = None
+
 '''
 拿到一行程式 只用一個表格回答：
 
@@ -30,49 +49,563 @@ import pymupdf
 '''
 
 
-#open()讓檔案變成"可以被操作的物件"，因為原本他只是一串二位元資料
-doc = pymupdf.open("streaming.pdf") #要雙引號表示字串
+log = logging.getLogger("uploads")
+
+PDF_PATH = "streaming.pdf" #要雙引號表示字串
+OUT_PATH = "output.txt"
+
+#抽文字的後端：pymupdf（預設）或 pypdfium2（Chromium 的 PDFium）
+#切換方式：PDF_BACKEND=pypdfium2 python uploads.py，或 --backend pypdfium2
+BACKEND = os.getenv("PDF_BACKEND", "pymupdf")
+BACKENDS = ("pymupdf", "pypdfium2")
+
+#每頁抽出來的文字存在這裡：~/.cache/uploads/<後端>-<版本>/<PDF 內容的 md5>/<頁碼>.txt
+#同一份 PDF 再跑一次，直接讀檔就好，不用再叫 MuPDF 解析
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "uploads")
+
+
+def open_pdf(path, backend="pymupdf"):
+    '''
+    pypdfium2：PDFium 自己用路徑開檔，直接交給它。
+
+    pymupdf：
+    用記憶體映射（mmap）開 PDF：檔案內容直接對應到記憶體位址，
+    MuPDF 跳著讀 xref / 物件時只是移動指標，不用每次 seek + read 系統呼叫。
+    memoryview(mm) 不會複製資料；doc 持有它，所以 mm 會活到 doc 不用為止。
+    '''
+    if backend not in BACKENDS:
+        #不認得的名字不要默默當成 pymupdf，直接報錯
+        raise ValueError(f"不支援的 PDF 後端：{backend!r}（可用：{', '.join(BACKENDS)}）")
+    if backend == "pypdfium2":
+        if pdfium is None:
+            raise RuntimeError("PDF_BACKEND=pypdfium2 需要先安裝：pip install pypdfium2")
+        return pdfium.PdfDocument(path)
+
+    with open(path, "rb") as f:
+        #空檔案不能 mmap（ValueError）；交給 pymupdf 自己開，才會拿到它原本的 EmptyFileError
+        if os.fstat(f.fileno()).st_size == 0:
+            return pymupdf.open(path)
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    #PDF 是照 xref 跳著讀，不是從頭讀到尾；告訴 OS 不要預讀太多（只有 Linux 等平台有）
+    if hasattr(mmap, "MADV_RANDOM"):
+        mm.madvise(mmap.MADV_RANDOM)
+    return pymupdf.open(stream=memoryview(mm), filetype="pdf")
+
+
+def page_text(doc, i, backend="pymupdf"):
+    #兩個後端取第 i 頁文字的方式不同，這裡統一成「給頁碼、拿 str」
+    if backend == "pypdfium2":
+        page = doc[i]
+        textpage = page.get_textpage()
+        try:
+            #PDFium 的換行是 \r\n，統一成跟 PyMuPDF 一樣的 \n
+            return textpage.get_text_range().replace("\r\n", "\n")
+        finally:
+            textpage.close()
+            page.close()
+    #load_page(i) 直接用頁碼取頁
+    return doc.load_page(i).get_text("text")
+
+
+def backend_version(backend):
+    if backend not in BACKENDS:
+        raise ValueError(f"不支援的 PDF 後端：{backend!r}（可用：{', '.join(BACKENDS)}）")
+    if backend == "pypdfium2":
+        return f"pypdfium2-{pdfium.PYPDFIUM_INFO}"
+    return f"pymupdf-{pymupdf.__version__}"
+
+
+def pdf_cache_dir(path, backend="pymupdf"):
+    #用檔案「內容」算 md5 當 key：檔名一樣但內容改了，就是新的快取
+    h = hashlib.md5()
+    with open(path, "rb") as f:
+        #從頭讀到尾：告訴核心可以加大預讀（posix_fadvise 只有 Linux 等平台有）
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    #換了後端或版本，抽出來的文字可能不一樣，所以也放進路徑
+    return os.path.join(CACHE_DIR, backend_version(backend), h.hexdigest())
+
+
+def _cache_path(cache_dir, i):
+    return os.path.join(cache_dir, f"{i}.txt")
+
+
+def _read_cache(cache_dir, i):
+    with open(_cache_path(cache_dir, i), "rb") as f:
+        return f.read()
+
+
+def _write_cache(cache_dir, i, data):
+    #先寫暫存檔再 os.replace：中途當掉也不會留下寫一半的快取（存在的快取檔一定是完整的）
+    path = _cache_path(cache_dir, i)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _open_cache_dir(path, backend):
+    '''
+    準備這份 PDF 的快取資料夾，回傳路徑。
+    快取只是加速用：~/.cache 不能寫（唯讀、磁碟滿、HOME 不是資料夾…）就回傳 None，照樣抽文字，只是不存快取
+    '''
+    cache_dir = pdf_cache_dir(path, backend)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+    except OSError as e:
+        log.warning("快取資料夾不能用，這次不使用快取：%s", e)
+        return None
+    return cache_dir
 
-'''
-讀取硬碟上的 PDF
-解析 PDF 結構（頁面、字型、圖片、metadata…）
-建立一個 Document 類別的實例，且把這個實例交給變數 doc
-'''
 
-#在此的open()是python內建的函式，可以開啟檔案、指定開檔案的mode, "wb"表示開啟一個可以寫入的二進位檔案, w是寫入模式
-out = open("output.txt", "wb") # create a text output file 
+#每個 worker 行程自己開一份 PDF（pymupdf 的 Document 不能 pickle，不能從主行程傳過去）
+_worker_doc = None
+_worker_cache_dir = None
+_worker_backend = None
 
 
-#PyMuPDF 的 Document 物件實作了「可迭代協定」，因此可以直接用 for 迴圈來逐頁讀取 PDF，doc 看起來不像 list，但它「行為像 list」
-for page in doc:
-    #先從page物件取得文字內容，再用encode("utf8")把字串轉成utf8編碼的位元組(bytes)
-    text = page.get_text().encode("utf8") 
-    
-    
+def _init_worker(path, cache_dir, backend):
+    global _worker_doc, _worker_cache_dir, _worker_backend
+    _worker_cache_dir = cache_dir
+    _worker_backend = backend
+    #open()讓檔案變成"可以被操作的物件"，因為原本他只是一串二位元資料
+    _worker_doc = open_pdf(path, backend)
+
+    '''
+    讀取硬碟上的 PDF
+    解析 PDF 結構（頁面、字型、圖片、metadata…）
+    建立一個 Document 類別的實例，且把這個實例交給變數 _worker_doc
+    每個 worker 只開一次，之後分到的頁都用同一份
     '''
-        | 步驟   | 正確答案                   |
-        | ---- | ---------------------- |
-        | 輸入型別 | `str` 或 `bytes`（看檔案模式） |
-        | 轉換   | 無                      |
-        | 輸出   | 資料被寫入磁碟檔案              |
 
-    
+
+def extract_page(i):
+    #先從第 i 頁取得文字內容，再用encode("utf8")把字串轉成utf8編碼的位元組(bytes)
+    #分頁符號不在這裡接（`+` 會再複製一次整頁），交給主行程的 writev 一起送出
     '''
+        | 步驟   | 答案                                   |
+        | ---- | ------------------------------------ |
+        | 輸入型別 | `int`（頁碼）                            |
+        | 轉換   | `page_text` → `encode`               |
+        | 輸出   | `bytes`：一頁文字，回傳給主行程                   |
 
-    out.write(text) # write text of page
-    
     '''
-        | 步驟   | 答案           |
-        | ---- | ------------ |
-        | 輸入型別 | `bytes`      |
-        | 轉換   | 無            |
-        | 輸出   | `0x0C` 被寫入檔案 |
+    global _worker_cache_dir
+
+    text = page_text(_worker_doc, i, _worker_backend)
+    #空白頁（封面、分隔頁、只有圖片的掃描頁）：沒東西可以 encode，直接回傳空的
+    data = text.encode("utf8") if text else b""
+    #順便存進快取（各 worker 自己寫，寫快取也一起平行）
+    if _worker_cache_dir is not None:
+        try:
+            _write_cache(_worker_cache_dir, i, data)
+        except OSError as e:
+            #寫不進去就算了，這個 worker 之後也不再試（避免每頁都警告一次）
+            log.warning("寫快取失敗，這個 worker 之後不再寫快取：%s", e)
+            _worker_cache_dir = None
+    return data
+
+
+FF = b"\x0c" #分頁符號 (form feed 0x0C)，只建立一次，每頁共用同一個物件
+
+#一次 writev 最多帶幾段、累積多少 bytes 就送出（Linux 的 IOV_MAX 是 1024）
+IOV_MAX = 1024
+IOV_MAX_BYTES = 1 << 20
+
 
+def _write_all(fd, iov):
+    '''
+    把 iov（多段 bytes）寫進 fd。
+    有 os.writev（Linux / macOS）：多段資料一次系統呼叫送出，不用先接成一大塊
+    沒有（Windows）：接起來用 os.write
+    '''
+    if hasattr(os, "writev"):
+        written = os.writev(fd, iov)
+        if written == sum(map(len, iov)):
+            return
+        #少見：只寫了一部分（磁碟滿、被訊號打斷…），剩下的接起來補寫
+        rest = memoryview(b"".join(iov))[written:]
+    else:
+        rest = memoryview(b"".join(iov))
+    while rest:
+        rest = rest[os.write(fd, rest):]
+
+
+#寫檔佇列最多放幾批 iov（每批最多 IOV_MAX_BYTES）；滿了主行程就先等，寫檔那一側最多積約 8 MiB
+#抽文字那一側另外由 PAGE_WINDOW 限制（見 _extract_windowed），兩邊都有上限，整體記憶體才有上限
+WRITE_QUEUE_SIZE = 8
+
+
+def _writer(fd, q, errors, comp=None):
+    '''
+    背景寫檔執行緒：從佇列拿一批 iov 就寫出去，拿到 None 表示結束。
+    comp 是 zlib 壓縮器時，先壓縮再寫（壓縮也在這個執行緒做，跟主行程收頁面同時進行）
+    寫檔出錯時把錯誤記下來，但繼續把佇列拿空，主行程才不會卡在 put()
+    '''
+    while (iov := q.get()) is not None:
+        if not errors:
+            try:
+                if comp is not None:
+                    #壓縮器會自己累積，輸出可能是空的 b""，空的就不用寫
+                    iov = [out for out in map(comp.compress, iov) if out]
+                if iov:
+                    _write_all(fd, iov)
+            except (OSError, zlib.error) as e:
+                errors.append(e)
+    if comp is not None and not errors:
+        try:
+            _write_all(fd, [comp.flush()]) #壓縮器裡剩下的資料 + gzip 結尾
+        except (OSError, zlib.error) as e:
+            errors.append(e)
+
+
+PAGE_CHUNK = 8 #一次送幾頁給 worker，減少行程間來回
+PAGE_WINDOW = 2 #每個 worker 同時最多排幾批：一批在抽、一批排著等，worker 不會閒著
+
+
+def extract_pages(pages):
+    #一次抽一批頁（list of int），回傳對應的 list of bytes
+    return [extract_page(i) for i in pages]
+
+
+def _extract_windowed(ex, missing, window):
+    '''
+    照順序產生 missing 這些頁的文字。
+    ex.map 會一開始就把所有頁都送出去，主行程還沒拿走的結果會一直堆在記憶體裡；
+    這裡同時最多只有 window 批（每批 PAGE_CHUNK 頁）在跑或等著被拿走，拿走一批才補送一批
+    中途不要了（generator 被 close）就把還沒開始的批次取消
+    '''
+    chunks = (missing[k:k + PAGE_CHUNK] for k in range(0, len(missing), PAGE_CHUNK))
+    pending = deque(ex.submit(extract_pages, chunk) for chunk in islice(chunks, window))
+    try:
+        while pending:
+            done = pending.popleft().result()
+            #先補送下一批再交出結果，worker 不用等主行程寫完
+            for chunk in islice(chunks, 1):
+                pending.append(ex.submit(extract_pages, chunk))
+            yield from done
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def cached_pages(cache_dir, page_count):
+    #哪些頁已經有快取檔（存在就一定是完整的，見 _write_cache）
+    return {i for i in range(page_count) if os.path.isfile(_cache_path(cache_dir, i))}
+
+
+def iter_pages(path, page_count, cache_dir, cached, backend="pymupdf", page_workers=None):
+    '''
+    照頁碼順序產生每一頁的文字（bytes）。
+    cached 裡的頁直接讀快取檔；其他頁才交給 worker 抽文字。
+    cache_dir 是 None：快取不能用，全部都抽、也不寫快取。
+    page_workers=1：不開行程池，在目前的行程裡一頁一頁抽（檔案層級已經平行時用）
+    '''
+    missing = [i for i in range(page_count) if i not in cached]
+
+    if not missing:
+        for i in range(page_count):
+            yield _read_cache(cache_dir, i)
+        return
+
+    #每頁互相獨立，可以分給多個行程同時抽文字（繞過 GIL）；超過 4 個 worker 效益就不大了
+    workers = page_workers or max(1, min(os.cpu_count() or 1, 4, len(missing)))
+
+    if workers == 1:
+        _init_worker(path, cache_dir, backend)
+        extracted = map(extract_page, missing)
+        for i in range(page_count):
+            if i in cached:
+                yield _read_cache(cache_dir, i)
+            else:
+                yield next(extracted)
+        return
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(path, cache_dir, backend)) as ex:
+        #行程之間只傳頁碼（int）過去、傳 bytes 回來；結果照頁碼順序交回來，跟快取的頁照順序穿插就好
+        extracted = _extract_windowed(ex, missing, workers * PAGE_WINDOW)
+        try:
+            for i in range(page_count):
+                if i in cached:
+                    yield _read_cache(cache_dir, i)
+                else:
+                    yield next(extracted)
+        finally:
+            extracted.close() #離開 with 之前先取消還沒開始的批次，shutdown 才不用等它們跑完
+
+
+def is_blank_page(data):
+    #「沒有文字」的判斷只有這一個：空的或全是空白字元（兩條輸出路徑都用它，結果才會一致）
+    return not data.strip()
+
+
+def _log_blank_page(path, i):
+    log.info("%s 第 %d 頁沒有文字（可能是掃描圖片，需要 OCR）", path, i + 1)
+
+
+def log_blank_pages(pages, path):
+    '''
+    原封不動轉交每一頁，順便記下沒有文字的頁：
+    通常是只有圖片的掃描頁，之後要另外跑 OCR 才抽得到字
+    '''
+    try:
+        for i, data in enumerate(pages):
+            if is_blank_page(data):
+                _log_blank_page(path, i)
+            yield data
+    finally:
+        pages.close() #被提早關掉時，連同底下的 iter_pages 一起關
+
+
+def _write_pages(fd, pages, compress=False):
+    #主行程收頁面（等 worker、反序列化）的同時，背景執行緒在寫檔：總時間變成兩者取大，不是相加
+    q = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+    errors = []
+    #wbits=31：輸出 gzip 格式（可以直接用 gzip / zcat 打開）；level 1 最快，文字還是能壓到幾分之一
+    comp = zlib.compressobj(1, zlib.DEFLATED, 31) if compress else None
+    writer = threading.Thread(target=_writer, args=(fd, q, errors, comp))
+    writer.start()
+    try:
+        #iov：還沒交給寫檔執行緒的資料段，頁面文字和 FF 交錯放，不複製內容
+        iov = []
+        iov_bytes = 0
+
+        for data in pages:
+            #寫檔已經失敗：後面的頁不用再抽了，直接停
+            if errors:
+                break
+            #一頁最多放兩段（文字 + FF，空白頁只有 FF），先確定放得下再放：一次 writev 不能超過 IOV_MAX 段
+            if len(iov) + 2 > IOV_MAX or iov_bytes >= IOV_MAX_BYTES:
+                q.put(iov) #交出去之後不能再動這個 list，所以換一個新的
+                iov = []
+                iov_bytes = 0
+            if data: #空白頁只寫分頁符號
+                iov.append(data)
+            iov.append(FF)
+            iov_bytes += len(data) + 1
+
+        if iov:
+            q.put(iov)
+    finally:
+        pages.close() #提早離開（寫檔失敗、出錯）時，讓 iter_pages 停止送頁、取消還沒開始的抽取
+        q.put(None)
+        writer.join()
+
+    if errors:
+        raise errors[0]
+
+    '''
+        | 步驟   | 答案                                   |
+        | ---- | ------------------------------------ |
+        | 輸入型別 | `list[bytes]`（頁面文字和分頁符號交錯）           |
+        | 轉換   | 無（不接成一大塊）                            |
+        | 輸出   | 一次 writev 把多段資料寫入磁碟檔案                 |
+
+    '''
+
+
+#os.sendfile 寫到一般檔案只有 Linux 支援（macOS 的輸出端必須是 socket）
+SENDFILE_TO_FILE = hasattr(os, "sendfile") and sys.platform.startswith("linux")
+
+
+def _cache_file_is_blank(src, size):
+    '''
+    快取檔的內容是不是空白頁（跟 is_blank_page 同一個標準）。
+    一段一段 pread，遇到第一個不是空白的字元就停：有字的頁通常第一段就判斷完了
+    '''
+    offset = 0
+    while offset < size:
+        chunk = os.pread(src, 4096, offset)
+        if not chunk:
+            break
+        if not is_blank_page(chunk):
+            return False
+        offset += len(chunk)
+    return True
+
+
+def _sendfile_pages(fd, cache_dir, page_count, path):
+    '''
+    每一頁都有快取時：用 os.sendfile 讓核心直接把快取檔搬進輸出檔，
+    資料不用先 read 進 Python 再 write 出去（少一次複製、也不佔 Python 記憶體）
+    '''
+    for i in range(page_count):
+        src = os.open(_cache_path(cache_dir, i), os.O_RDONLY)
+        try:
+            size = os.fstat(src).st_size
+            if _cache_file_is_blank(src, size):
+                _log_blank_page(path, i)
+            os.posix_fadvise(src, 0, 0, os.POSIX_FADV_SEQUENTIAL) #這條路徑只在 Linux 上走
+            offset = 0
+            while offset < size:
+                #sendfile 可能一次沒送完，送多少就往前推多少
+                sent = os.sendfile(fd, src, offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+        finally:
+            os.close(src)
+        os.write(fd, FF)
+
+
+def extract(path, out_path, force_refresh=False, backend=BACKEND, compress=False, page_workers=None):
+    '''
+    把一份 PDF 的文字抽出來寫到 out_path（compress=True 時寫成 out_path + ".gz"）
+    每頁後面接一個分頁符號 (form feed 0x0C)
+    '''
+    with open_pdf(path, backend) as doc:
+        page_count = len(doc)
+
+    cache_dir = _open_cache_dir(path, backend)
+    if cache_dir is None or force_refresh:
+        cached = set()
+    else:
+        cached = cached_pages(cache_dir, page_count)
+
+    #os.open 拿到的是檔案描述子（int），直接跟作業系統要寫入，不經過 Python 的緩衝層
+    #O_BINARY 只有 Windows 有，避免換行被轉換
+    #compress=True：寫成 .gz（少寫很多 bytes；讀的人要先解壓，例如 gzip.open）
+    if compress:
+        out_path += ".gz"
+    fd = os.open(out_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        #sendfile 是原封不動搬資料，要壓縮就不能走這條
+        if SENDFILE_TO_FILE and not compress and cache_dir is not None and len(cached) == page_count:
+            _sendfile_pages(fd, cache_dir, page_count, path)
+        else:
+            pages = iter_pages(path, page_count, cache_dir, cached, backend, page_workers)
+            _write_pages(fd, log_blank_pages(pages, path), compress)
+    finally:
+        os.close(fd)
+
+
+def _extract_file(path, out_path, force_refresh, backend, compress):
+    #檔案層級已經平行了，每份 PDF 在自己的 worker 裡逐頁抽（page_workers=1），不再開第二層行程池
+    extract(path, out_path, force_refresh, backend, compress, page_workers=1)
+
+
+def _init_file_worker(level):
+    #spawn 出來的 worker 沒有主行程的 logging 設定，要自己設一次（fork 的話已經有了，這行不會改到）
+    logging.basicConfig(level=level, format="%(message)s")
+
+
+def _run_jobs(jobs, workers, force_refresh, backend, compress):
+    #跑一批 jobs，回傳失敗的 [(job, 錯誤), ...]
+    with ProcessPoolExecutor(workers, initializer=_init_file_worker, initargs=(log.getEffectiveLevel(),)) as ex:
+        futures = {
+            ex.submit(_extract_file, path, out_path, force_refresh, backend, compress): (path, out_path)
+            for path, out_path in jobs
+        }
+    #離開 with 時已經等全部做完了，這裡只是收結果
+    return [(job, future.exception()) for future, job in futures.items() if future.exception() is not None]
+
+
+def extract_many(jobs, force_refresh=False, backend=BACKEND, compress=False, retries=1):
+    '''
+    jobs：[(pdf 路徑, 輸出路徑), ...]
+    多份 PDF 時，一個 worker 負責一整份（彼此完全獨立，不用分享任何東西）。
+    失敗的（壞檔、worker 掛掉…）最多再試 retries 次，還是失敗就記下來、繼續做其他份。
+    回傳最後還是失敗的 PDF 路徑。
+    '''
+    workers = max(1, min(8, os.cpu_count() or 1, len(jobs)))
+    failed = _run_jobs(jobs, workers, force_refresh, backend, compress)
+
+    #有一份把 worker 整個弄掛（例如 MuPDF segfault），整個行程池就壞了，其他還沒做完的也一起收到 BrokenProcessPool。
+    #那些不一定是自己的錯：每份各開一個單獨的行程池重跑一次（不算在 retries 裡），真正會掛的那份才會再失敗
+    broken = [job for job, error in failed if isinstance(error, BrokenProcessPool)]
+    failed = [(job, error) for job, error in failed if not isinstance(error, BrokenProcessPool)]
+    if broken:
+        log.info("行程池壞掉了，%d 份 PDF 個別重跑", len(broken))
+    for job in broken:
+        failed += _run_jobs([job], 1, force_refresh, backend, compress)
+
+    for attempt in range(retries + 1):
+        for (path, _), error in failed:
+            log.warning("%s 失敗（第 %d 次）：%r", path, attempt + 1, error)
+        if not failed or attempt == retries:
+            break
+        #重試也是一份一個行程池，不會再拖累別人
+        failed = [result for job, _ in failed for result in _run_jobs([job], 1, force_refresh, backend, compress)]
+    return [path for (path, _), _ in failed]
+
+
+def _same_file(a, b):
+    try:
+        return os.path.samefile(a, b)
+    except OSError: #有一個不存在：讓 extract 自己報錯
+        return os.path.normcase(os.path.abspath(a)) == os.path.normcase(os.path.abspath(b))
+
+
+def output_path_for(path):
+    #a.pdf / a.PDF → a.txt；其他副檔名（或沒有）就直接接 .txt：notes.txt → notes.txt.txt，不會蓋掉輸入檔
+    root, ext = os.path.splitext(path)
+    if ext.lower() == ".pdf":
+        return root + ".txt"
+    return path + ".txt"
+
+
+def plan_jobs(paths):
+    '''
+    每份 PDF 寫到同名的 .txt（見 output_path_for），回傳 (jobs, rejected)。
+    輸出檔如果剛好就是某一個輸入檔，那份不做，放進 rejected（不能把使用者給的檔案蓋掉）。
+    兩個 worker 同時寫同一個輸出檔會把它寫壞，所以輸出檔重複時：
+    - 同一份 PDF 給了兩次（或 a.pdf / a.PDF 其實是同一個檔）：只做一次
+    - 不同的 PDF 撞到同一個輸出檔：後面那份不做，放進 rejected
     '''
-    
-    out.write(bytes((12,))) # write page delimiter (form feed 0x0C)
+    jobs = []
+    rejected = []
+    by_out = {}
+    for path in paths:
+        out_path = output_path_for(path)
+        clobbered = next((p for p in paths if _same_file(p, out_path)), None)
+        if clobbered is not None:
+            log.warning("%s 的輸出檔 %s 就是輸入檔 %s，略過", path, out_path, clobbered)
+            rejected.append(path)
+            continue
+        key = os.path.normcase(os.path.abspath(out_path))
+        if key in by_out:
+            if not _same_file(by_out[key], path):
+                log.warning("%s 的輸出檔 %s 跟 %s 重複，略過", path, out_path, by_out[key])
+                rejected.append(path)
+            continue
+        by_out[key] = path
+        jobs.append((path, out_path))
+    return jobs, rejected
 
 
+def main(paths=(), force_refresh=False, backend=BACKEND, compress=False):
+    #沒給路徑：跟以前一樣，streaming.pdf → output.txt
+    if not paths:
+        extract(PDF_PATH, OUT_PATH, force_refresh, backend, compress)
+        return []
+    jobs, rejected = plan_jobs(paths)
+    if len(jobs) == 1:
+        extract(*jobs[0], force_refresh, backend, compress)
+        return rejected
+    return rejected + extract_many(jobs, force_refresh, backend, compress)
 
-out.close()
 
+#Windows 用 spawn 開新行程，會重新 import 這個檔案；沒有這行保護，每個 worker 都會再跑一次 main()
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser()
+    parser.add_argument("pdfs", nargs="*", help="要抽文字的 PDF（不給就是 streaming.pdf → output.txt）")
+    parser.add_argument("--refresh", action="store_true", help="忽略快取，每一頁都重新抽文字")
+    parser.add_argument("--backend", choices=BACKENDS, default=BACKEND, help="抽文字的後端（預設看 PDF_BACKEND 環境變數）")
+    parser.add_argument("--gzip", action="store_true", help="輸出寫成 gzip 壓縮的 .txt.gz")
+    args = parser.parse_args()
+    #argparse 不會拿 choices 檢查 default，所以 PDF_BACKEND 亂填要自己擋
+    if args.backend not in BACKENDS:
+        parser.error(f"PDF_BACKEND={args.backend!r} 不支援（可用：{', '.join(BACKENDS)}）")
+    failed = main(args.pdfs, force_refresh=args.refresh, backend=args.backend, compress=args.gzip)
+    if failed:
+        sys.exit(1)